@@ -6,11 +6,14 @@
 
 import pandas as pd
 import numpy as np
+import os
+import matplotlib
+HEADLESS = bool(os.environ.get('HEADLESS'))
+if HEADLESS:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split, GridSearchCV
-from typing import Tuple
+from sklearn.linear_model import LinearRegression
+from typing import Optional, Tuple
 
 # Define constants for circularity scoring
 CIRCULARITY_FACTORS = {
@@ -20,6 +23,11 @@ CIRCULARITY_FACTORS = {
     "carbon_footprint": -0.1  # Negative as lower is better
 }
 
+# Factor names and weights, built once at import. The names are kept as a list
+# because pandas treats a tuple passed to df[...] as a single column label.
+_CF_KEYS = list(CIRCULARITY_FACTORS.keys())
+_CF_WEIGHTS = np.array(list(CIRCULARITY_FACTORS.values()), dtype=np.float32)
+
 def calculate_circularity_score(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate circularity score for each material in the dataset.
@@ -31,8 +39,7 @@ def calculate_circularity_score(df: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame: DataFrame with an additional column for circularity scores.
     """
     try:
-        weights = np.array([CIRCULARITY_FACTORS[factor] for factor in CIRCULARITY_FACTORS.keys()])
-        df['circularity_score'] = df[list(CIRCULARITY_FACTORS.keys())].dot(weights)
+        df['circularity_score'] = df[_CF_KEYS].to_numpy(dtype=np.float32, copy=False) @ _CF_WEIGHTS
     except KeyError as e:
         raise KeyError(f"Missing column in input data: {e}")
     return df
@@ -48,95 +55,117 @@ def preprocess_data(file_path: str) -> pd.DataFrame:
     pd.DataFrame: Preprocessed DataFrame.
     """
     try:
-        df = pd.read_csv(file_path)
+        start = file_path.tell() if hasattr(file_path, 'seek') else None
+        header = pd.read_csv(file_path, nrows=0).columns
+        if start is not None:
+            file_path.seek(start)
+        df = pd.read_csv(
+            file_path,
+            engine='pyarrow',
+            usecols=[col for col in ['material'] + _CF_KEYS if col in header],
+            dtype={col: np.float32 for col in _CF_KEYS},
+        )
         # Check if required columns are present
-        missing_columns = [col for col in CIRCULARITY_FACTORS.keys() if col not in df.columns]
+        missing_columns = [col for col in _CF_KEYS if col not in df.columns]
         if missing_columns:
             raise ValueError(f"Input data is missing required columns: {missing_columns}")
 
         # Fill missing values with column means
-        df.fillna(df.mean(numeric_only=True), inplace=True)
-
-        # Scale numerical features
-        scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(df[list(CIRCULARITY_FACTORS.keys())])
-        df[list(CIRCULARITY_FACTORS.keys())] = scaled_features
+        values = df[_CF_KEYS].to_numpy(dtype=np.float32)
+        missing = np.isnan(values)
+        values[missing] = np.take(np.nanmean(values, axis=0), np.where(missing)[1])
+
+        # Scale numerical features (zero mean, unit variance; constant columns are left centred)
+        std = values.std(axis=0)
+        std[std == 0] = 1.0
+        values -= values.mean(axis=0)
+        values /= std
+        df[_CF_KEYS] = values
     except FileNotFoundError:
         raise FileNotFoundError(f"The file at {file_path} was not found.")
     except Exception as e:
         raise Exception(f"An error occurred during preprocessing: {e}")
     return df
 
-def visualize_circularity(df: pd.DataFrame) -> None:
+def visualize_circularity(df: pd.DataFrame, output_path: Optional[str] = None) -> plt.Figure:
     """
     Visualize circularity scores using a bar chart.
 
     Parameters:
     df (pd.DataFrame): DataFrame containing circularity scores and material names.
+    output_path (Optional[str]): Save the chart to this path instead of showing it.
+
+    Returns:
+    plt.Figure: The circularity score chart.
     """
     try:
         df = df.sort_values(by='circularity_score', ascending=False)
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         plt.bar(df['material'], df['circularity_score'], color='skyblue')
         plt.xlabel('Material')
         plt.ylabel('Circularity Score')
         plt.title('Circularity Scores by Material')
         plt.xticks(rotation=45, ha='right')
         plt.tight_layout()
-        plt.show()
+        if output_path:
+            fig.savefig(output_path, dpi=100)
+            plt.close(fig)
+        else:
+            plt.show()
+            if HEADLESS:
+                plt.close(fig)
     except KeyError as e:
         raise KeyError(f"Missing column for visualization: {e}")
+    return fig
 
-def optimize_material_substitution(df: pd.DataFrame) -> RandomForestRegressor:
+def optimize_material_substitution(df: pd.DataFrame, plot_path: Optional[str] = None) -> LinearRegression:
     """
-    Use a Random Forest model to predict the impact of changing material properties on circularity.
+    Fit a linear model of how material properties drive circularity.
+
+    The circularity score is a fixed weighted sum of the features, so a single
+    least-squares fit recovers it exactly and feature importance follows
+    directly from the scoring weights.
 
     Parameters:
     df (pd.DataFrame): DataFrame containing features and target variable.
+    plot_path (Optional[str]): Save the feature importance chart to this path instead of showing it.
 
     Returns:
-    RandomForestRegressor: Best Random Forest model after hyperparameter tuning.
+    LinearRegression: Linear model fitted on the circularity factors.
     """
     try:
-        features = list(CIRCULARITY_FACTORS.keys())
         target = 'circularity_score'
 
-        X = df[features]
+        X = df[_CF_KEYS]
         y = df[target]
 
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-        # Define model and hyperparameter tuning
-        rf = RandomForestRegressor(random_state=42)
-        param_grid = {
-            'n_estimators': [50, 100, 200],
-            'max_depth': [None, 10, 20],
-            'min_samples_split': [2, 5, 10]
-        }
-        grid_search = GridSearchCV(estimator=rf, param_grid=param_grid, cv=2, scoring='r2')
-        grid_search.fit(X_train, y_train)
-
-        best_model = grid_search.best_estimator_
+        model = LinearRegression()
+        model.fit(X, y)
 
         # Feature importance visualization
-        feature_importances = best_model.feature_importances_
-        plt.figure(figsize=(8, 5))
-        plt.bar(features, feature_importances, color='green')
+        feature_importances = np.abs(_CF_WEIGHTS) / np.abs(_CF_WEIGHTS).sum()
+        fig = plt.figure(figsize=(8, 5))
+        plt.bar(_CF_KEYS, feature_importances, color='green')
         plt.xlabel('Feature')
         plt.ylabel('Importance')
         plt.title('Feature Importance in Circularity Prediction')
         plt.tight_layout()
-        plt.show()
+        if plot_path:
+            fig.savefig(plot_path, dpi=100)
+            plt.close(fig)
+        else:
+            plt.show()
+            if HEADLESS:
+                plt.close(fig)
 
     except KeyError as e:
         raise KeyError(f"Missing required columns for model training: {e}")
     except ValueError as e:
-        raise ValueError(f"Error during model training or hyperparameter tuning: {e}")
+        raise ValueError(f"Error during model training: {e}")
     except Exception as e:
         raise Exception(f"An unexpected error occurred: {e}")
 
-    return best_model
+    return model
 
 def save_results(df: pd.DataFrame, output_path: str) -> None:
     """
@@ -174,8 +203,8 @@ def main() -> None:
 
         # Optimize material substitution
         print("Optimizing material substitutions...")
-        best_model = optimize_material_substitution(df)
-        print("Best Random Forest Model:", best_model)
+        model = optimize_material_substitution(df)
+        print("Fitted Linear Model Coefficients:", dict(zip(_CF_KEYS, model.coef_)))
 
         # Save results
         save_results(df, output_path)
@@ -6,30 +6,44 @@
 
 import pandas as pd
 import numpy as np
+import os
+import matplotlib
+HEADLESS = bool(os.environ.get('HEADLESS'))
+if HEADLESS:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.optimize import minimize
 import logging
-from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class LifecycleImpactSimulator:
+    REQUIRED_COLUMNS = ['Stage', 'Cost', 'Carbon_Footprint', 'Water_Usage', 'Energy_Consumption']
+    NUMERIC_COLUMNS = ['Cost', 'Carbon_Footprint', 'Water_Usage', 'Energy_Consumption']
+
     def __init__(self, data_file):
         """
         Initialize the simulator with lifecycle impact data from a CSV file.
         The CSV should have columns: 'Stage', 'Cost', 'Carbon_Footprint', 'Water_Usage', 'Energy_Consumption'.
         """
         logging.info("Initializing Lifecycle Impact Simulator.")
-        self.data = pd.read_csv(data_file)
+        start = data_file.tell() if hasattr(data_file, 'seek') else None
+        header = pd.read_csv(data_file, nrows=0).columns
+        if start is not None:
+            data_file.seek(start)
+        self.data = pd.read_csv(
+            data_file,
+            engine='pyarrow',
+            usecols=[col for col in self.REQUIRED_COLUMNS if col in header],
+            dtype={'Stage': 'category', **{col: np.float32 for col in self.NUMERIC_COLUMNS}},
+        )
         self._validate_data()
 
     def _validate_data(self):
         """Validate the input data format."""
         logging.info("Validating input data.")
-        required_columns = ['Stage', 'Cost', 'Carbon_Footprint', 'Water_Usage', 'Energy_Consumption']
-        for col in required_columns:
+        for col in self.REQUIRED_COLUMNS:
             if col not in self.data.columns:
                 logging.error(f"Missing required column: {col}")
                 raise ValueError(f"Missing required column: {col}")
@@ -47,76 +61,39 @@ class LifecycleImpactSimulator:
     def normalize_columns(self):
         logging.info("Normalizing columns for simulation.")
         columns_to_normalize = ['Cost', 'Carbon_Footprint', 'Water_Usage', 'Energy_Consumption']
-        for col in columns_to_normalize:
-            col_min = self.data[col].min()
-            col_max = self.data[col].max()
-            if col_max - col_min == 0:
+        arr = self.data[columns_to_normalize].to_numpy(dtype=np.float32)
+        col_min = np.nanmin(arr, axis=0)  # Skip missing cells, as the pandas min/max did
+        col_range = np.nanmax(arr, axis=0) - col_min
+        for col, rng in zip(columns_to_normalize, col_range):
+            if rng == 0:
                 logging.warning(f"Column {col} has zero variance. Filling normalized values with 0.")
-                self.data[f"{col}_normalized"] = 0
-            else:
-                self.data[f"{col}_normalized"] = (
-                    (self.data[col] - col_min) / (col_max - col_min)
-                )
-
-
-    # def simulate(self, weight_cost=0.3, weight_carbon=0.3, weight_water=0.2, weight_energy=0.2):
-    #     """
-    #     Simulate lifecycle impact based on weighted criteria.
-
-    #     Weights:
-    #     - weight_cost: Weight for cost efficiency.
-    #     - weight_carbon: Weight for reducing carbon footprint.
-    #     - weight_water: Weight for minimizing water usage.
-    #     - weight_energy: Weight for reducing energy consumption.
-    #     """
-    #     logging.info("Starting simulation with weights: cost=%s, carbon=%s, water=%s, energy=%s",
-    #                  weight_cost, weight_carbon, weight_water, weight_energy)
-    #     self.normalize_columns()
-
-    #     def objective_function(x):
-    #         """Objective function to minimize."""
-    #         return (
-    #             weight_cost * x[0] +
-    #             weight_carbon * x[1] +
-    #             weight_water * x[2] +
-    #             weight_energy * x[3]
-    #         )
-
-    #     results = []
-
-    #     def process_row(row):
-    #         x0 = [row['Cost_normalized'], row['Carbon_Footprint_normalized'],
-    #               row['Water_Usage_normalized'], row['Energy_Consumption_normalized']]
-    #         res = minimize(objective_function, x0, bounds=[(0, 1)] * 4)
-    #         return row['Stage'], res.fun
-
-    #     with ThreadPoolExecutor() as executor:
-    #         results = list(executor.map(process_row, [row for _, row in self.data.iterrows()]))
-
-    #     self.simulation_results = sorted(results, key=lambda x: x[1])
-    #     logging.info("Simulation completed.")
-    #     return self.simulation_results
+        col_range[col_range == 0] = 1.0
+        self.data[[f"{col}_normalized" for col in columns_to_normalize]] = (arr - col_min) / col_range
+
 
     def simulate(self, weight_cost=0.3, weight_carbon=0.3, weight_water=0.2, weight_energy=0.2):
+        """
+        Simulate lifecycle impact based on weighted criteria.
+
+        Weights:
+        - weight_cost: Weight for cost efficiency.
+        - weight_carbon: Weight for reducing carbon footprint.
+        - weight_water: Weight for minimizing water usage.
+        - weight_energy: Weight for reducing energy consumption.
+        """
         logging.info("Starting simulation with weights: cost=%s, carbon=%s, water=%s, energy=%s",
                     weight_cost, weight_carbon, weight_water, weight_energy)
         self.normalize_columns()
 
-        results = []
+        normalized_columns = ['Cost_normalized', 'Carbon_Footprint_normalized',
+                              'Water_Usage_normalized', 'Energy_Consumption_normalized']
+        M = self.data[normalized_columns].to_numpy(dtype=float)
+        weights = np.array([weight_cost, weight_carbon, weight_water, weight_energy])
+        scores = M @ weights  # Lower is better for every metric, so no column is flipped
 
-        def process_row(row):
-            score = (
-                weight_cost * row['Cost_normalized'] +
-                weight_carbon * row['Carbon_Footprint_normalized'] +
-                weight_water * row['Water_Usage_normalized'] +
-                weight_energy * row['Energy_Consumption_normalized']
-            )
-            return row['Stage'], score
-
-        with ThreadPoolExecutor() as executor:
-            results = list(executor.map(process_row, [row for _, row in self.data.iterrows()]))
-
-        self.simulation_results = sorted(results, key=lambda x: x[1])
+        stages = self.data['Stage'].to_numpy()
+        order = np.argsort(scores, kind='stable')
+        self.simulation_results = list(zip(stages[order].tolist(), scores[order].tolist()))
         logging.info("Simulation completed.")
         return self.simulation_results
 
@@ -133,8 +110,13 @@ class LifecycleImpactSimulator:
         for stage, score in self.simulation_results:
             print(f"{stage}\t\t{score:.2f}")
 
-    def visualize_results(self):
-        """Visualize the simulation results as a bar chart."""
+    def visualize_results(self, output_file=None):
+        """
+        Visualize the simulation results as a bar chart.
+
+        If output_file is given the chart is saved there instead of being shown.
+        Returns the matplotlib Figure.
+        """
         if not hasattr(self, 'simulation_results'):
             logging.error("Attempted to visualize results before running simulation.")
             raise ValueError("Run simulate() before visualizing results.")
@@ -142,13 +124,20 @@ class LifecycleImpactSimulator:
         stages = [result[0] for result in self.simulation_results]
         scores = [result[1] for result in self.simulation_results]
 
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         sns.barplot(x=scores, y=stages, palette="coolwarm")
         plt.xlabel('Impact Score', fontsize=14)
         plt.ylabel('Lifecycle Stage', fontsize=14)
         plt.title('Lifecycle Impact Simulation Results', fontsize=16)
         plt.tight_layout()
-        plt.show()
+        if output_file:
+            fig.savefig(output_file, dpi=100)
+            plt.close(fig)
+        else:
+            plt.show()
+            if HEADLESS:
+                plt.close(fig)
+        return fig
 
     def export_results(self, output_file="simulation_results.csv"):
         """Export simulation results to a CSV file."""
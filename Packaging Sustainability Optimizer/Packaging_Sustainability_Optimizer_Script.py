@@ -6,42 +6,129 @@
 
 import pandas as pd
 import numpy as np
-from scipy.optimize import minimize
+import os
+import matplotlib
+HEADLESS = bool(os.environ.get('HEADLESS'))
+if HEADLESS:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import argparse
+from dataclasses import dataclass
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; optimize() falls back to the NumPy path
+    njit = None
+
+# Row count from which optimize() scores with the fused Numba kernel
+NUMBA_MIN_ROWS = 100_000
+# Recyclability and durability are "higher is better", so they are flipped before weighting
+FLIP_MASK = np.array([False, True, False, True])
+
+if njit is not None:
+    # Fast-math without 'nnan'/'ninf': missing cells are NaN and must be skipped, not assumed away
+    @njit(parallel=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'}, cache=True)
+    def _score_kernel(arr, weights, flip_mask):
+        """Min-max normalize each column, flip where requested and return the weighted row sums."""
+        n_rows, n_cols = arr.shape
+        col_min = np.empty(n_cols, dtype=arr.dtype)
+        col_range = np.empty(n_cols, dtype=arr.dtype)
+        for j in range(n_cols):
+            lo = np.inf
+            hi = -np.inf
+            for i in range(n_rows):
+                value = arr[i, j]
+                if np.isnan(value):  # Skipped like np.nanmin/np.nanmax in normalize_columns()
+                    continue
+                lo = min(lo, value)
+                hi = max(hi, value)
+            col_min[j] = lo
+            col_range[j] = hi - lo if hi > lo else 1.0
+
+        out = np.empty(n_rows, dtype=np.float64)
+        for i in prange(n_rows):
+            acc = 0.0
+            for j in range(n_cols):
+                value = (arr[i, j] - col_min[j]) / col_range[j]
+                if flip_mask[j]:
+                    value = 1.0 - value
+                acc += weights[j] * value
+            out[i] = acc
+        return out
+else:
+    _score_kernel = None
+
+@dataclass
+class LinearScorer:
+    """Weighted sum of normalized metrics; metrics marked in flip are "higher is better" and scored as 1 - x."""
+    __slots__ = ('weights', 'flip')
+    weights: np.ndarray
+    flip: np.ndarray
+
+    def __call__(self, M):
+        return np.where(self.flip, 1 - M, M) @ self.weights
+
+def check_score_kernel(n_rows=1_000, seed=0):
+    """
+    Check that the Numba kernel and LinearScorer give the same scores.
+
+    The random input has a missing cell in its first row, so NaN handling is
+    covered. Returns True when they agree, or when Numba is not installed.
+    """
+    if _score_kernel is None:
+        return True
+    arr = np.random.default_rng(seed).random((n_rows, len(FLIP_MASK)), dtype=np.float32)
+    arr[0, 0] = np.nan
+    weights = np.array([0.3, 0.4, 0.2, 0.1])
+
+    col_min = np.nanmin(arr, axis=0)
+    col_range = np.nanmax(arr, axis=0) - col_min
+    col_range[col_range == 0] = 1.0
+    expected = LinearScorer(weights, FLIP_MASK)((arr - col_min) / col_range)
+    return bool(np.allclose(_score_kernel(arr, weights, FLIP_MASK), expected, rtol=1e-5, equal_nan=True))
 
 class PackagingSustainabilityOptimizer:
+    REQUIRED_COLUMNS = ['Material', 'Cost_per_unit', 'Recyclability', 'Carbon_Footprint', 'Durability']
+    NUMERIC_COLUMNS = ['Cost_per_unit', 'Recyclability', 'Carbon_Footprint', 'Durability']
+
     def __init__(self, data_file):
         """
         Initialize the optimizer with data from a CSV file.
         The CSV should have columns: 'Material', 'Cost_per_unit', 'Recyclability', 'Carbon_Footprint', 'Durability'.
         """
-        self.data = pd.read_csv(data_file)
+        start = data_file.tell() if hasattr(data_file, 'seek') else None
+        header = pd.read_csv(data_file, nrows=0).columns
+        if start is not None:
+            data_file.seek(start)
+        self.data = pd.read_csv(
+            data_file,
+            engine='pyarrow',
+            usecols=[col for col in self.REQUIRED_COLUMNS if col in header],
+            dtype={'Material': 'category', **{col: np.float32 for col in self.NUMERIC_COLUMNS}},
+        )
         self._validate_data()
 
     def _validate_data(self):
         """Validate the input data format."""
-        required_columns = ['Material', 'Cost_per_unit', 'Recyclability', 'Carbon_Footprint', 'Durability']
-        for col in required_columns:
+        for col in self.REQUIRED_COLUMNS:
             if col not in self.data.columns:
                 raise ValueError(f"Missing required column: {col}")
 
     def normalize_columns(self):
         """Normalize columns for comparison purposes."""
         columns_to_normalize = ['Cost_per_unit', 'Recyclability', 'Carbon_Footprint', 'Durability']
-        for col in columns_to_normalize:
-            if col in self.data.columns:
-                col_min = self.data[col].min()
-                col_max = self.data[col].max()
-                if col_max - col_min == 0:
-                    print(f"[Warning] Column '{col}' has zero variance. Setting normalized values to 0.")
-                    self.data[f"{col}_normalized"] = 0
-                else:
-                    self.data[f"{col}_normalized"] = (
-                        (self.data[col] - col_min) / (col_max - col_min)
-                    )
+        arr = self.data[columns_to_normalize].to_numpy(dtype=np.float32)
+        col_min = np.nanmin(arr, axis=0)  # Skip missing cells, as the pandas min/max did
+        col_range = np.nanmax(arr, axis=0) - col_min
+        for col, rng in zip(columns_to_normalize, col_range):
+            if rng == 0:
+                print(f"[Warning] Column '{col}' has zero variance. Setting normalized values to 0.")
+        col_range[col_range == 0] = 1.0
+        self._normed = (arr - col_min) / col_range
+        self._normed_cols = [f"{col}_normalized" for col in columns_to_normalize]
+        self.data[self._normed_cols] = self._normed
 
     def optimize(self, weight_cost=0.3, weight_recyclability=0.4, weight_carbon_footprint=0.2, weight_durability=0.1):
         """
@@ -52,28 +139,48 @@ class PackagingSustainabilityOptimizer:
         - weight_recyclability: Weight for recyclability
         - weight_carbon_footprint: Weight for carbon footprint reduction
         - weight_durability: Weight for durability
+
+        With Numba installed and at least NUMBA_MIN_ROWS materials, normalization and
+        scoring run as one fused kernel and the normalized columns are not stored.
         """
-        self.normalize_columns()
+        weights = np.array([weight_cost, weight_recyclability, weight_carbon_footprint, weight_durability])
+
+        if _score_kernel is not None and len(self.data) >= NUMBA_MIN_ROWS:
+            arr = self.data[self.NUMERIC_COLUMNS].to_numpy(dtype=np.float32)
+            scores = _score_kernel(arr, weights, FLIP_MASK)
+        else:
+            self.normalize_columns()
+            scores = LinearScorer(weights, FLIP_MASK)(self._normed)
+
+        materials = self.data['Material'].to_numpy()
+        order = np.argsort(scores, kind='stable')
+        self.optimized_results = list(zip(materials[order].tolist(), scores[order].tolist()))
+        return self.optimized_results
 
-        def objective_function(x):
-            """Objective function to minimize."""
-            return (
-                weight_cost * x[0] +
-                weight_recyclability * (1 - x[1]) +  # Higher recyclability is better, so subtract from 1
-                weight_carbon_footprint * x[2] +
-                weight_durability * (1 - x[3])  # Higher durability is better, so subtract from 1
-            )
+    def optimize_batch(self, weights):
+        """
+        Score every material under several weight settings in one pass.
 
-        results = []
-        for index, row in self.data.iterrows():
-            x0 = [row['Cost_per_unit_normalized'], row['Recyclability_normalized'],
-                  row['Carbon_Footprint_normalized'], row['Durability_normalized']]
+        Parameters:
+        - weights: Array-like of shape (k, 4); each row holds the cost, recyclability,
+          carbon footprint and durability weights of one scenario.
 
-            res = minimize(objective_function, x0, bounds=[(0, 1)] * 4)
-            results.append((row['Material'], res.fun))
+        Returns a dict mapping each weight tuple to its sorted (material, score) list.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        if weights.shape[1] != 4:
+            raise ValueError("Weights must have shape (k, 4).")
 
-        self.optimized_results = sorted(results, key=lambda x: x[1])
-        return self.optimized_results
+        self.normalize_columns()
+        scores = LinearScorer(weights.T, FLIP_MASK)(self._normed)
+        order = np.argsort(scores, axis=0, kind='stable')
+
+        materials = self.data['Material'].to_numpy()
+        results = {}
+        for j, weight_row in enumerate(weights):
+            rows = order[:, j]
+            results[tuple(weight_row.tolist())] = list(zip(materials[rows].tolist(), scores[rows, j].tolist()))
+        return results
 
     def display_results(self):
         """Display the optimization results."""
@@ -95,15 +202,20 @@ class PackagingSustainabilityOptimizer:
         results_df.to_csv(output_file, index=False)
         print(f"Results exported to {output_file}")
 
-    def visualize_results(self):
-        """Visualize the optimization results as a professional bar chart."""
+    def visualize_results(self, output_file=None):
+        """
+        Visualize the optimization results as a professional bar chart.
+
+        If output_file is given the chart is saved there instead of being shown.
+        Returns the matplotlib Figure.
+        """
         if not hasattr(self, 'optimized_results'):
             raise ValueError("Run optimize() before visualizing results.")
 
         materials = [result[0] for result in self.optimized_results]
         scores = [result[1] for result in self.optimized_results]
 
-        plt.figure(figsize=(12, 8))
+        fig = plt.figure(figsize=(12, 8))
         sns.barplot(x=scores, y=materials, palette="viridis")
         plt.xlabel('Sustainability Score', fontsize=14)
         plt.ylabel('Material', fontsize=14)
@@ -112,18 +224,34 @@ class PackagingSustainabilityOptimizer:
         plt.yticks(fontsize=12)
         plt.grid(axis='x', linestyle='--', alpha=0.7)
         plt.tight_layout()
-        plt.show()
-
-    def visualize_metric_breakdown(self):
-        """Visualize the breakdown of metrics for each material."""
-        normalized_columns = ['Cost_per_unit_normalized', 'Recyclability_normalized', 'Carbon_Footprint_normalized', 'Durability_normalized']
-        if not all(col in self.data.columns for col in normalized_columns):
-            raise ValueError("Normalized columns are missing. Run normalize_columns() before visualizing metrics.")
-
-        melted_data = self.data[['Material'] + normalized_columns].melt(id_vars='Material', var_name='Metric', value_name='Value')
+        if output_file:
+            fig.savefig(output_file, dpi=100)
+            plt.close(fig)
+        else:
+            plt.show()
+            if HEADLESS:
+                plt.close(fig)
+        return fig
+
+    def visualize_metric_breakdown(self, output_file=None):
+        """
+        Visualize the breakdown of metrics for each material.
 
-        plt.figure(figsize=(14, 8))
-        sns.barplot(x='Value', y='Material', hue='Metric', data=melted_data, palette='pastel')
+        The metrics are normalized afresh, so the chart matches the current data
+        whichever optimize() path ran. If output_file is given the chart is saved
+        there instead of being shown. Returns the matplotlib Figure.
+        """
+        self.normalize_columns()
+        n_materials, n_metrics = self._normed.shape
+        y = np.arange(n_materials)
+        height = 0.8 / n_metrics
+        colors = sns.color_palette('pastel', n_metrics)
+
+        fig, ax = plt.subplots(figsize=(14, 8))
+        for i, col in enumerate(self._normed_cols):
+            ax.barh(y + (i - (n_metrics - 1) / 2) * height, self._normed[:, i], height, label=col, color=colors[i])
+        ax.set_yticks(y, self.data['Material'].to_numpy())
+        ax.invert_yaxis()  # First material at the top
         plt.xlabel('Normalized Value', fontsize=14)
         plt.ylabel('Material', fontsize=14)
         plt.title('Metric Breakdown by Material', fontsize=16)
@@ -132,7 +260,14 @@ class PackagingSustainabilityOptimizer:
         plt.yticks(fontsize=12)
         plt.grid(axis='x', linestyle='--', alpha=0.7)
         plt.tight_layout()
-        plt.show()
+        if output_file:
+            fig.savefig(output_file, dpi=100)
+            plt.close(fig)
+        else:
+            plt.show()
+            if HEADLESS:
+                plt.close(fig)
+        return fig
 
     def visualize_results_interactive(self):
         """Visualize optimization results interactively using Plotly."""
@@ -149,15 +284,21 @@ class PackagingSustainabilityOptimizer:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Packaging Sustainability Optimizer")
-    parser.add_argument("data_file", type=str, help="Path to the CSV file containing packaging data")
+    parser.add_argument("data_file", type=str, nargs='?', help="Path to the CSV file containing packaging data")
     parser.add_argument("--output_file", type=str, default="optimized_results.csv", help="File name for exporting results")
     parser.add_argument("--weight_cost", type=float, default=0.3, help="Weight for cost efficiency")
     parser.add_argument("--weight_recyclability", type=float, default=0.4, help="Weight for recyclability")
     parser.add_argument("--weight_carbon_footprint", type=float, default=0.2, help="Weight for carbon footprint")
     parser.add_argument("--weight_durability", type=float, default=0.1, help="Weight for durability")
+    parser.add_argument("--check_kernel", action="store_true", help="Check the Numba kernel against the NumPy scorer and exit")
 
     args = parser.parse_args()
 
+    if args.check_kernel:
+        agree = check_score_kernel()
+        print("Numba kernel matches the NumPy scorer." if agree else "Numba kernel does NOT match the NumPy scorer.")
+        raise SystemExit(0 if agree else 1)
+
     data_file = "E:\walmart-project\Packaging Sustainability Optimizer\material_data.csv"
 
     optimizer = PackagingSustainabilityOptimizer(data_file)
@@ -5,13 +5,22 @@
 
 
 import pandas as pd
+import numpy as np
 import logging
 from datetime import datetime
+from joblib import Parallel, delayed, cpu_count
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Row count above which the compliance comparison is split across threads;
+# below it, thread start-up costs more than the single vectorized compare.
+PARALLEL_COMPLIANCE_THRESHOLD = 1_000_000
+
 class RegulatoryComplianceValidator:
+    REQUIRED_DATA_COLUMNS = ['Entity', 'Requirement', 'Status', 'Date']
+    REQUIRED_REGULATION_COLUMNS = ['Requirement', 'Description', 'Threshold']
+
     def __init__(self, data_file, regulations_file):
         """
         Initialize the validator with compliance data and regulations.
@@ -21,22 +30,43 @@ class RegulatoryComplianceValidator:
         - regulations_file (str): Path to the CSV file containing regulatory requirements.
         """
         logging.info("Initializing Regulatory Compliance Validator.")
-        self.data = pd.read_csv(data_file)
-        self.regulations = pd.read_csv(regulations_file)
+        self.data = self._read_columns(data_file, self.REQUIRED_DATA_COLUMNS, numeric_columns=['Status'],
+                                       categorical_columns=['Entity', 'Requirement'])
+        self.regulations = self._read_columns(regulations_file, self.REQUIRED_REGULATION_COLUMNS,
+                                              numeric_columns=['Threshold'], categorical_columns=[])
         self._validate_data()
 
+    @staticmethod
+    def _read_columns(file_path, columns, numeric_columns, categorical_columns):
+        """
+        Read only the given columns that exist in the CSV.
+
+        Numeric columns are loaded as float64, so threshold comparisons keep full
+        precision, and repeated-string columns as categoricals.
+        """
+        start = file_path.tell() if hasattr(file_path, 'seek') else None
+        header = pd.read_csv(file_path, nrows=0).columns
+        if start is not None:
+            file_path.seek(start)
+        return pd.read_csv(
+            file_path,
+            engine='pyarrow',
+            usecols=[col for col in columns if col in header],
+            dtype={
+                **{col: np.float64 for col in numeric_columns},
+                **{col: 'category' for col in categorical_columns},
+            },
+        )
+
     def _validate_data(self):
         """Validate the input data format."""
         logging.info("Validating input data format.")
-        required_data_columns = ['Entity', 'Requirement', 'Status', 'Date']
-        required_regulation_columns = ['Requirement', 'Description', 'Threshold']
-
-        for col in required_data_columns:
+        for col in self.REQUIRED_DATA_COLUMNS:
             if col not in self.data.columns:
                 logging.error(f"Missing required column in data: {col}")
                 raise ValueError(f"Missing required column in data: {col}")
 
-        for col in required_regulation_columns:
+        for col in self.REQUIRED_REGULATION_COLUMNS:
             if col not in self.regulations.columns:
                 logging.error(f"Missing required column in regulations: {col}")
                 raise ValueError(f"Missing required column in regulations: {col}")
@@ -48,10 +78,25 @@ class RegulatoryComplianceValidator:
         Adds a 'Compliance' column to the data indicating whether each entity is compliant or non-compliant.
         """
         logging.info("Checking compliance.")
-        self.data = self.data.merge(self.regulations, on='Requirement', how='left')
-
-        self.data['Compliance'] = self.data.apply(
-            lambda row: 'Compliant' if row['Status'] >= row['Threshold'] else 'Non-Compliant', axis=1
+        requirements = self.regulations['Requirement'].to_numpy()
+        descriptions = dict(zip(requirements, self.regulations['Description'].to_numpy()))
+        thresholds = dict(zip(requirements, self.regulations['Threshold'].to_numpy()))
+        self.data['Description'] = self.data['Requirement'].map(descriptions)
+        # Mapping a categorical can return a categorical, so the thresholds are cast back to numbers
+        self.data['Threshold'] = self.data['Requirement'].map(thresholds).astype(np.float64)
+
+        status = self.data['Status'].to_numpy()
+        threshold = self.data['Threshold'].to_numpy()
+        if len(status) > PARALLEL_COMPLIANCE_THRESHOLD:
+            n_chunks = cpu_count()
+            chunks = zip(np.array_split(status, n_chunks), np.array_split(threshold, n_chunks))
+            compliant = np.concatenate(
+                Parallel(n_jobs=-1, prefer='threads')(delayed(np.greater_equal)(s, t) for s, t in chunks)
+            )
+        else:
+            compliant = status >= threshold
+        self.data['Compliance'] = pd.Categorical(
+            np.where(compliant, 'Compliant', 'Non-Compliant'), categories=['Compliant', 'Non-Compliant']
         )
 
     def generate_compliance_summary(self):
@@ -65,7 +110,17 @@ class RegulatoryComplianceValidator:
             logging.error("Compliance check not performed. Run check_compliance() first.")
             raise ValueError("Run check_compliance() before generating summary.")
 
-        summary = self.data.groupby(['Entity', 'Compliance']).size().unstack(fill_value=0)
+        entity_codes, entities = pd.factorize(self.data['Entity'], sort=True)
+        non_compliant = (self.data['Compliance'] == 'Non-Compliant').to_numpy().astype(np.int8)
+        has_entity = entity_codes >= 0  # Rows without an entity are left out, as groupby would
+        counts = np.bincount(
+            entity_codes[has_entity] * 2 + non_compliant[has_entity], minlength=len(entities) * 2
+        ).reshape(-1, 2)
+        summary = pd.DataFrame(
+            counts,
+            index=pd.Index(entities, name='Entity'),
+            columns=pd.Index(['Compliant', 'Non-Compliant'], name='Compliance'),
+        )
         overall_summary = self.data['Compliance'].value_counts()
 
         print("\nEntity-Level Compliance Summary:\n")
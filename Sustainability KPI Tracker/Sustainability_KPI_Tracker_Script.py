@@ -5,53 +5,259 @@
 
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 import logging
+import os
+import tempfile
 from datetime import datetime
-from plotly import express as px
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the kernels below fall back to NumPy/pandas
+    njit = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+if njit is not None:
+    # The explicit signature compiles eagerly and, with cache=True, is loaded from
+    # __pycache__ on later runs instead of paying the JIT cost on first use.
+    @njit('Tuple((float64[:], int64[:]))(int64[:], float32[:], int64)', cache=True)
+    def _kpi_summary_kernel(codes, performance, n_groups):
+        """Return the mean performance and on-track count of each KPI group in a single pass."""
+        sums = np.zeros(n_groups)  # float64 accumulators, even for float32 performance
+        counts = np.zeros(n_groups, dtype=np.int64)
+        on_track = np.zeros(n_groups, dtype=np.int64)
+        for i in range(performance.size):
+            code = codes[i]
+            value = performance[i]
+            if code < 0 or np.isnan(value):  # Missing KPI or performance, skipped like pandas does
+                continue
+            sums[code] += value
+            counts[code] += 1
+            if value >= 100.0:
+                on_track[code] += 1
+        return sums / counts, on_track
+
+    @njit(parallel=True, cache=True, error_model='numpy')  # Inputs may be read-only Arrow-backed views
+    def _perf_status_kernel(target, actual, performance, status):
+        """Fill performance (%) and the 0/1 on-track status from a single read of target and actual."""
+        for i in prange(target.size):
+            value = actual[i] / target[i] * np.float32(100.0) if target[i] != 0 else np.float32(np.nan)
+            performance[i] = value
+            status[i] = 1 if value >= 100.0 else 0
+else:
+    _kpi_summary_kernel = None
+    _perf_status_kernel = None
+
+# Row count from which calculate_performance() uses the fused Numba kernel; below it
+# the NumPy path is faster than starting (or first compiling) the parallel kernel
+NUMBA_MIN_ROWS = 100_000
+# KPI count from which the interactive bar chart drops bar gaps and outlines to keep the SVG light
+DENSE_CHART_MIN_KPIS = 50
+
 class SustainabilityKPITracker:
-    def __init__(self, data_file):
+    __slots__ = (
+        'data', '_performance_ready', '_perf', '_kpi_codes', '_kpi_levels', '_backend', '_lazy', '_summary'
+    )
+    REQUIRED_COLUMNS = ['KPI', 'Target', 'Actual', 'Date']
+    STATUS_LABELS = ['Needs Improvement', 'On Track']
+
+    def __init__(self, data_file, use_cache=True, backend='pandas'):
         """
         Initialize the tracker with sustainability KPI data from a CSV file.
         The CSV should have columns: 'KPI', 'Target', 'Actual', 'Date'.
+
+        With use_cache and a path-like data_file, the typed data is kept in
+        '<data_file>.parquet' and reloaded from there while it is at least as new as the CSV.
+
+        With backend='polars' the CSV is only scanned here (use_cache is ignored);
+        calculate_performance() then runs the performance, status and summary steps
+        as one lazy Polars query and fills self.data with the result.
         """
         logging.info("Initializing Sustainability KPI Tracker.")
-        self.data = pd.read_csv(data_file, parse_dates=['Date'])
-        self._validate_data()
+        if backend not in ('pandas', 'polars'):
+            raise ValueError(f"Unknown backend: {backend}. Use 'pandas' or 'polars'.")
+        self._backend = backend
+        self._summary = None
+        self._performance_ready = False
+
+        if backend == 'polars':
+            # Polars is optional and only imported for this backend, keeping pandas start-up light
+            try:
+                import polars as pl
+            except ImportError as e:
+                raise ImportError("The polars backend requires the polars package.") from e
+            self._lazy = pl.scan_csv(data_file, try_parse_dates=True)
+            self.data = None
+            self._validate_data(self._lazy.collect_schema().names())
+            return
+
+        # Only local files are cached; buffers and URLs are always parsed
+        cache_path = None
+        if use_cache and isinstance(data_file, (str, os.PathLike)) and os.path.isfile(data_file):
+            cache_path = os.fspath(data_file) + '.parquet'
 
-    def _validate_data(self):
-        """Validate the input data format."""
+        self.data = self._read_cache(cache_path, data_file) if cache_path else None
+        if self.data is not None:
+            self._validate_data()
+        else:
+            self.data = self._read_csv(data_file)
+            self._validate_data()
+            if cache_path:
+                self._write_cache(self.data, cache_path)
+
+    @staticmethod
+    def _read_cache(cache_path, data_file):
+        """Return the cached data if the cache is at least as new as the CSV and readable, else None."""
+        if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(data_file):
+            return None
+        try:
+            data = pd.read_parquet(cache_path, engine='pyarrow')
+        except (OSError, ValueError) as e:  # A damaged cache is ignored and rebuilt from the CSV
+            logging.warning(f"Ignoring unreadable data cache {cache_path}: {e}")
+            return None
+        logging.info(f"Loaded cached data from {cache_path}.")
+        return data
+
+    @staticmethod
+    def _write_cache(data, cache_path):
+        """Write the cache to a temporary file and move it into place, so readers never see a partial file."""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=os.path.basename(cache_path) + '.', suffix='.tmp', dir=os.path.dirname(cache_path) or '.'
+            )
+            os.close(fd)
+            data.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write data cache {cache_path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def _read_csv(cls, data_file):
+        """
+        Read the required KPI columns from the CSV with their final dtypes.
+
+        Dates are parsed as YYYY-MM-DD first, then per value in mixed formats; a
+        column that still does not parse is kept as strings, as plain read_csv did.
+        """
+        start = data_file.tell() if hasattr(data_file, 'seek') else None
+        header = pd.read_csv(data_file, nrows=0).columns
+        if start is not None:
+            data_file.seek(start)
+        data = pd.read_csv(
+            data_file,
+            engine='pyarrow',
+            usecols=[col for col in cls.REQUIRED_COLUMNS if col in header],
+            dtype={'KPI': 'category', 'Target': np.float32, 'Actual': np.float32},
+            parse_dates=['Date'] if 'Date' in header else False,
+            date_format='%Y-%m-%d',
+        )
+        if 'Date' in data.columns and not pd.api.types.is_datetime64_any_dtype(data['Date']):
+            try:
+                data['Date'] = pd.to_datetime(data['Date'], format='mixed')
+            except ValueError as e:
+                logging.warning(f"Could not parse the Date column, keeping it as text: {e}")
+        return data
+
+    def _validate_data(self, columns=None):
+        """Validate the input data format; columns defaults to those of self.data."""
         logging.info("Validating input data.")
-        required_columns = ['KPI', 'Target', 'Actual', 'Date']
-        for col in required_columns:
-            if col not in self.data.columns:
+        if columns is None:
+            columns = self.data.columns
+        for col in self.REQUIRED_COLUMNS:
+            if col not in columns:
                 logging.error(f"Missing required column: {col}")
                 raise ValueError(f"Missing required column: {col}")
 
     def calculate_performance(self):
-        """Calculate performance metrics for each KPI."""
+        """
+        Calculate performance metrics for each KPI.
+
+        Rows with a zero target get a NaN performance and are marked 'Needs Improvement'.
+        """
         logging.info("Calculating performance metrics.")
-        self.data['Performance'] = (self.data['Actual'] / self.data['Target']) * 100
-        self.data['Status'] = self.data['Performance'].apply(
-            lambda x: 'On Track' if x >= 100 else 'Needs Improvement'
+        if self._backend == 'polars':
+            self._calculate_performance_polars()
+            return
+
+        target = self.data['Target'].to_numpy()
+        actual = self.data['Actual'].to_numpy()
+        if _perf_status_kernel is not None and target.size >= NUMBA_MIN_ROWS:
+            performance = np.empty(target.size, dtype=np.float32)
+            status = np.empty(target.size, dtype=np.int8)
+            _perf_status_kernel(target, actual, performance, status)
+        else:
+            performance = np.full_like(actual, np.nan)
+            np.divide(actual, target, out=performance, where=target != 0)
+            performance *= 100
+            status = (performance >= 100.0).astype(np.int8)
+        self.data['Performance'] = performance
+        # Raw arrays reused by the summary so it skips DataFrame column lookups
+        self._perf = performance
+        self._kpi_codes, self._kpi_levels = pd.factorize(self.data['KPI'], sort=False)
+        self.data['Status'] = pd.Categorical.from_codes(status, categories=self.STATUS_LABELS)
+        self._performance_ready = True
+
+    def _calculate_performance_polars(self):
+        """Compute performance, status and the KPI summary in a single Polars query."""
+        import polars as pl
+
+        frame = self._lazy.select(
+            pl.col('KPI').cast(pl.Categorical),
+            pl.col('Target').cast(pl.Float32),
+            pl.col('Actual').cast(pl.Float32),
+            pl.col('Date'),
+        ).with_columns(
+            # No otherwise(): a zero target leaves a null, which pandas sees as NaN
+            pl.when(pl.col('Target') != 0).then(pl.col('Actual') / pl.col('Target') * 100).alias('Performance')
+        ).with_columns(
+            pl.when(pl.col('Performance') >= 100)
+            .then(pl.lit('On Track'))
+            .otherwise(pl.lit('Needs Improvement'))
+            .cast(pl.Enum(self.STATUS_LABELS))
+            .alias('Status')
         )
+        # Rows without a KPI stay in the data but, as in the pandas paths, not in the summary
+        summary = frame.filter(pl.col('KPI').is_not_null()).group_by('KPI', maintain_order=True).agg(
+            pl.col('Performance').mean().alias('Average Performance'),
+            (pl.col('Status') == 'On Track').sum().alias('On Track Count'),
+        )
+        # Collected together so the shared scan and arithmetic run once
+        data, summary = pl.collect_all([frame, summary], engine='streaming')
+        self.data = data.to_pandas()
+        self._summary = summary.to_pandas().set_index('KPI')
+        self._performance_ready = True
 
     def display_summary(self):
         """Display a summary of the KPI performance."""
         logging.info("Displaying KPI summary.")
-        if 'Performance' not in self.data.columns:
+        if not self._performance_ready:
             logging.error("Performance metrics not calculated. Run calculate_performance() first.")
             raise ValueError("Run calculate_performance() before displaying summary.")
 
-        summary = self.data.groupby('KPI').agg({
-            'Performance': 'mean',
-            'Status': lambda x: (x == 'On Track').sum()
-        }).rename(columns={'Performance': 'Average Performance', 'Status': 'On Track Count'})
+        # KPIs are listed in order of first appearance; no path sorts the groups
+        if self._summary is not None:
+            summary = self._summary
+        elif _kpi_summary_kernel is not None:
+            average, on_track = _kpi_summary_kernel(self._kpi_codes, self._perf, len(self._kpi_levels))
+            summary = pd.DataFrame(
+                {'Average Performance': average, 'On Track Count': on_track},
+                index=pd.Index(self._kpi_levels, name='KPI'),
+            )
+        else:
+            kpi = self.data['KPI']
+            summary = pd.DataFrame({
+                'Average Performance': self.data['Performance'].groupby(kpi, observed=True, sort=False).mean(),
+                # Status codes are 0 for 'Needs Improvement' and 1 for 'On Track'
+                'On Track Count': self.data['Status'].cat.codes.groupby(kpi, observed=True, sort=False).sum(),
+            })
 
         print("\nSustainability KPI Summary:\n")
         print(summary)
@@ -59,12 +265,19 @@ class SustainabilityKPITracker:
     def visualize_performance(self):
         """Visualize the performance of KPIs as a bar chart."""
         logging.info("Visualizing KPI performance.")
-        if 'Performance' not in self.data.columns:
+        if not self._performance_ready:
             logging.error("Performance metrics not calculated. Run calculate_performance() first.")
             raise ValueError("Run calculate_performance() before visualizing performance.")
 
-        plt.figure(figsize=(12, 6))
-        sns.barplot(x='KPI', y='Performance', hue='Status', data=self.data, palette='coolwarm')
+        # Plotting libraries are imported on first use so headless export runs skip their startup cost
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        mean_performance = (
+            self.data.groupby(['KPI', 'Status'], observed=True)['Performance'].mean().unstack('Status')
+        )
+        _, ax = plt.subplots(figsize=(12, 6))
+        mean_performance.plot.bar(ax=ax, width=0.8, color=sns.color_palette('coolwarm', mean_performance.shape[1]))
         plt.axhline(100, color='green', linestyle='--', label='Target Met')
         plt.title('Sustainability KPI Performance', fontsize=16)
         plt.xlabel('KPI', fontsize=14)
@@ -74,44 +287,86 @@ class SustainabilityKPITracker:
         plt.tight_layout()
         plt.show()
 
-    def visualize_interactive(self):
-        """Visualize KPI performance interactively using Plotly."""
+    def visualize_interactive(self, interactive=True, output_file="kpi_performance.png"):
+        """
+        Visualize KPI performance interactively using Plotly.
+
+        With interactive=False the chart is written to output_file as a static image
+        (requires kaleido) instead of being shown. Returns the Plotly Figure.
+        """
         logging.info("Creating interactive visualization.")
-        if 'Performance' not in self.data.columns:
+        if not self._performance_ready:
             logging.error("Performance metrics not calculated. Run calculate_performance() first.")
             raise ValueError("Run calculate_performance() before visualizing performance.")
 
+        from plotly import express as px
+
+        # One bar per KPI keeps the figure payload proportional to the number of KPIs, not rows
+        kpi_performance = self.data.groupby('KPI', observed=True)['Performance'].mean().reset_index()
+        performance = kpi_performance['Performance'].to_numpy()
+        kpi_performance['Status'] = np.where(performance >= 100.0, 'On Track', 'Needs Improvement')
+        kpi_performance['Label'] = np.char.add(np.char.mod('%.2f', performance), '%')
+
         fig = px.bar(
-            self.data,
+            kpi_performance,
             x='KPI',
             y='Performance',
             color='Status',
-            text='Performance',
+            text='Label',
             title='Interactive Sustainability KPI Performance',
             labels={"Performance": "Performance (%)", "KPI": "Key Performance Indicator"},
             template='plotly_white'
         )
-        fig.update_traces(texttemplate='%{text:.2f}%', textposition='outside')
+        fig.update_traces(textposition='outside')
         fig.add_hline(y=100, line_dash="dash", line_color="green", annotation_text="Target Met")
-        fig.show()
+        if len(kpi_performance) >= DENSE_CHART_MIN_KPIS:
+            fig.update_layout(bargap=0)
+            fig.update_traces(marker_line_width=0)
+        if interactive:
+            fig.show()
+        else:
+            fig.write_image(output_file)
+            logging.info(f"Interactive chart saved to {output_file}.")
+        return fig
 
     def export_results(self, output_file="kpi_performance_summary.csv"):
-        """Export the KPI performance results to a CSV file."""
+        """
+        Export the KPI performance results to a CSV file.
+
+        A path ending in '.parquet' writes a zstd-compressed Parquet file instead.
+        """
         logging.info(f"Exporting results to {output_file}.")
-        if 'Performance' not in self.data.columns:
+        if not self._performance_ready:
             logging.error("Performance metrics not calculated. Run calculate_performance() first.")
             raise ValueError("Run calculate_performance() before exporting results.")
 
-        self.data.to_csv(output_file, index=False)
+        table = pa.Table.from_pandas(self.data, preserve_index=False)
+        is_path = isinstance(output_file, (str, os.PathLike))
+        if is_path and os.fspath(output_file).endswith('.parquet'):
+            pq.write_table(table, output_file, compression='zstd')
+        else:
+            # Write day-resolution dates as YYYY-MM-DD rather than full timestamps
+            dates = self.data['Date'].to_numpy()
+            if pd.api.types.is_datetime64_any_dtype(dates) and (
+                (dates == dates.astype('datetime64[D]')) | np.isnat(dates)
+            ).all():
+                table = table.set_column(
+                    table.schema.get_field_index('Date'), 'Date', table['Date'].cast(pa.date32())
+                )
+            pacsv.write_csv(table, output_file)
         logging.info(f"Results exported successfully to {output_file}.")
 
     def add_trend_analysis(self):
         """Perform trend analysis on KPIs over time."""
         logging.info("Performing trend analysis on KPIs.")
-        trend_data = self.data.groupby(['Date', 'KPI'])['Performance'].mean().reset_index()
+        import matplotlib.pyplot as plt
+
+        trend_data = self.data.pivot_table(
+            index='Date', columns='KPI', values='Performance', aggfunc='mean', observed=True
+        )
 
-        plt.figure(figsize=(14, 7))
-        sns.lineplot(data=trend_data, x='Date', y='Performance', hue='KPI', marker="o")
+        _, ax = plt.subplots(figsize=(14, 7))
+        trend_data.plot(ax=ax, marker='o')
         plt.axhline(100, color='green', linestyle='--', label='Target Met')
         plt.title('KPI Performance Trend Over Time', fontsize=16)
         plt.xlabel('Date', fontsize=14)